@@ -4,10 +4,9 @@ from crewai.project import CrewBase, agent, crew, task
 
 from mf_portfolio_manager.tools.custom_tool import (
     get_scheme_details,
+    get_scheme_details_bulk,
     get_historical_nav,
-    get_large_cap_funds,
-    get_mid_cap_funds,
-    get_small_cap_funds,
+    get_all_cap_funds,
     calculate_sip_returns,
     calculate_lumpsum_returns,
     calculate_capital_gains_tax
@@ -16,6 +15,11 @@ from mf_portfolio_manager.tools.custom_tool import (
 TRACING_ENABLED = os.getenv("CREWAI_ENABLE_TRACKING", "true").lower() == "true"
 
 
+def _verbose_enabled() -> bool:
+    # Read at build time so entry points can opt in after importing this module.
+    return os.getenv("CREW_VERBOSE", "0").lower() in ("1", "true")
+
+
 @CrewBase
 class MutualFundCrew:
     """MfPortfolioManager crew"""
@@ -29,12 +33,12 @@ class MutualFundCrew:
             config=self.agents_config['mf_data_researcher'],
             tools = [
                 get_scheme_details,
+                get_scheme_details_bulk,
                 get_historical_nav,
-                get_large_cap_funds,
-                get_mid_cap_funds,
-                get_small_cap_funds
+                get_all_cap_funds
             ],
-            verbose=True
+            verbose=_verbose_enabled(),
+            cache=False
         )
 
     @agent
@@ -46,7 +50,8 @@ class MutualFundCrew:
                 calculate_lumpsum_returns,
                 calculate_capital_gains_tax
             ],
-            verbose=True
+            verbose=_verbose_enabled(),
+            cache=False
         )
     
     @agent
@@ -54,6 +59,8 @@ class MutualFundCrew:
         return Agent(
             config = self.agents_config['investment_advisor'],
             allow_delegation = False,
+            verbose=_verbose_enabled(),
+            cache=False
         )
 
     @task
@@ -88,6 +95,9 @@ class MutualFundCrew:
             agents=self.agents, 
             tasks=self.tasks, 
             process=Process.sequential,
-            verbose=True,
+            verbose=_verbose_enabled(),
             tracing=TRACING_ENABLED,
+            # Tool results are cached with TTLs in tools.custom_tool; crewAI's
+            # own cache never expires and would outlive them in pooled crews.
+            cache=False,
         )
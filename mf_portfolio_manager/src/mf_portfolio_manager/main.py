@@ -1,12 +1,14 @@
 #!/usr/bin/env python
-from json import load
+import os
 import sys
-from typing_extensions import override
 import warnings
 from mf_portfolio_manager.crew import MutualFundCrew
 from dotenv import load_dotenv
 
-load_dotenv(override=True)
+# Deployments that inject the environment through their process manager can
+# skip the .env filesystem lookup entirely.
+if os.getenv("MFPM_SKIP_DOTENV") != "1":
+    load_dotenv(override=False)
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -15,6 +17,7 @@ def run():
     """
     Run the mutual fund crew with custom inputs
     """
+    os.environ.setdefault("CREW_VERBOSE", "1")
     inputs = {
         # Fund category selection
         'fund_category': 'Large Cap',
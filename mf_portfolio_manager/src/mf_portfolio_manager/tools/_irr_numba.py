@@ -0,0 +1,108 @@
+"""Compiled IRR kernels for evenly spaced cash flows.
+
+numba is optional: when it is not installed the kernels run as plain Python
+over the same NumPy arrays.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+@njit(cache=True, fastmath=True)
+def _npv_sign(rate: float, cfs: np.ndarray) -> float:
+    """A value with the same sign as the NPV of `cfs` at `rate`.
+
+    Positive rates discount each flow; negative rates compound the flows
+    forward to the last period instead (Horner's scheme), which avoids
+    dividing by powers of (1 + rate) that underflow to zero near -100%.
+    """
+    total = 0.0
+    if rate >= 0:
+        factor = 1.0
+        for i in range(cfs.shape[0]):
+            total += cfs[i] / factor
+            factor *= (1 + rate)
+    else:
+        for i in range(cfs.shape[0]):
+            total = total * (1 + rate) + cfs[i]
+    return total
+
+
+@njit(cache=True)
+def _bisect_irr(cfs: np.ndarray, tol: float = 1e-6, max_iter: int = 200) -> float:
+    """Compute the periodic IRR of `cfs` using bisection."""
+    low, high = -0.5, 1.0
+    npv_low = _npv_sign(low, cfs)
+    npv_high = _npv_sign(high, cfs)
+
+    # Widen the bracket until it straddles the root: (1 + high) doubles and
+    # (1 + low) halves towards the -100% pole on every step.
+    expansion_steps = 0
+    while npv_low * npv_high > 0 and expansion_steps < 20:
+        low = -1 + (1 + low) / 2
+        high = 2 * high + 1
+        npv_low = _npv_sign(low, cfs)
+        npv_high = _npv_sign(high, cfs)
+        expansion_steps += 1
+
+    if npv_low * npv_high > 0:
+        # Fallback: IRR cannot be determined with current cash flows.
+        return 0.0
+
+    # Only signs are compared, so stop on the bracket width.
+    rate = (low + high) / 2
+    for _ in range(max_iter):
+        rate = (low + high) / 2
+        if high - low < tol:
+            return rate
+        npv_mid = _npv_sign(rate, cfs)
+        if npv_mid == 0:
+            return rate
+        if npv_low * npv_mid < 0:
+            high = rate
+        else:
+            low = rate
+            npv_low = npv_mid
+    return rate
+
+
+@njit(cache=True)
+def _irr_newton(
+    cfs: np.ndarray, guess: float = 0.01, tol: float = 1e-9, max_iter: int = 50
+) -> float:
+    """Compute the periodic IRR of `cfs` using Newton-Raphson.
+
+    NPV and its derivative are accumulated in a single pass over `cfs`.
+    Returns NaN when the iteration stalls or diverges so callers can fall back
+    to `_bisect_irr`.
+    """
+    rate = guess
+    for _ in range(max_iter):
+        base = 1 + rate
+        npv = 0.0
+        dnpv = 0.0
+        factor = 1.0
+        for i in range(cfs.shape[0]):
+            npv += cfs[i] / factor
+            dnpv -= i * cfs[i] / (factor * base)
+            factor *= base
+        if abs(dnpv) < 1e-12:
+            return np.nan
+        step = npv / dnpv
+        rate -= step
+        if not np.isfinite(rate) or rate <= -1.0:
+            return np.nan
+        if abs(step) < tol:
+            return rate
+    return np.nan
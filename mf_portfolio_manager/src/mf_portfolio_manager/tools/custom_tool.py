@@ -1,10 +1,148 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
+
 from crewai.tools import tool
-from datetime import datetime
 from mftool import Mftool
-from typing import Dict, List, Sequence
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from mf_portfolio_manager.tools._irr_numba import _bisect_irr, _irr_newton
+from mf_portfolio_manager.tools.quote_fetch import fetch_many_quotes, fetch_quote
 
 mf = Mftool()
 
+# The AMFI performance sheet is published at most daily; NAV quotes and history
+# are refreshed more eagerly so long-running servers pick up new NAVs.
+PERFORMANCE_TTL_SECONDS = 3600
+SCHEME_TTL_SECONDS = 900
+
+# (fund type, holding term) -> (tax rate, exempt gain, gain type, displayed rate).
+# Short term is a holding period under 12 months.
+_TAX_RULES = {
+    ("equity", "short"): (0.20, 0, "Short Term (STCG)", "20%"),
+    ("equity", "long"): (0.125, 125_000, "Long Term (LTCG)", "12.5%"),
+}
+
+
+def _ttl_cache(ttl_seconds: float, maxsize: int = 128):
+    """LRU cache whose entries are all dropped once `ttl_seconds` have elapsed.
+
+    Besides calling the wrapped function, callers can peek at an entry with
+    `cache_get(*args)` and store one fetched elsewhere with
+    `cache_set(value, *args)`.
+    """
+
+    def decorator(func):
+        entries: OrderedDict = OrderedDict()
+        lock = threading.Lock()
+        expires_at = 0.0
+
+        def _expire() -> None:
+            nonlocal expires_at
+            now = time.monotonic()
+            if now >= expires_at:
+                entries.clear()
+                expires_at = now + ttl_seconds
+
+        def cache_get(*args):
+            with lock:
+                _expire()
+                if args not in entries:
+                    return None
+                entries.move_to_end(args)
+                return entries[args]
+
+        def cache_set(value, *args) -> None:
+            with lock:
+                _expire()
+                entries[args] = value
+                entries.move_to_end(args)
+                if len(entries) > maxsize:
+                    entries.popitem(last=False)
+
+        def cache_clear() -> None:
+            with lock:
+                entries.clear()
+
+        @wraps(func)
+        def wrapper(*args):
+            value = cache_get(*args)
+            if value is None:
+                value = func(*args)
+                cache_set(value, *args)
+            return value
+
+        wrapper.cache_get = cache_get
+        wrapper.cache_set = cache_set
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+@_ttl_cache(PERFORMANCE_TTL_SECONDS, maxsize=1)
+def _fetch_performance() -> Dict:
+    """Performance data for every open-ended equity category, keyed by category."""
+    return mf.get_open_ended_equity_scheme_performance()
+
+
+@_ttl_cache(SCHEME_TTL_SECONDS, maxsize=256)
+def _fetch_scheme_quote(scheme_code: str) -> Dict:
+    return fetch_quote(scheme_code)
+
+
+@_ttl_cache(SCHEME_TTL_SECONDS, maxsize=256)
+def _fetch_historical_nav(scheme_code: str) -> Dict:
+    return mf.get_scheme_historical_nav(scheme_code)
+
+
+def _date_key(date: str) -> int:
+    """Sortable YYYYMMDD integer for an AMFI 'DD-MM-YYYY' date string."""
+    return int(date[6:10]) * 10000 + int(date[3:5]) * 100 + int(date[:2])
+
+
+class _NavHistory(NamedTuple):
+    """Chronologically sorted NAV history of a scheme."""
+
+    scheme_name: Optional[str]
+    navs: np.ndarray  # float64
+    monthly_navs: np.ndarray  # float64, latest NAV of each calendar month
+
+    def navs_last_n(self, n: int) -> np.ndarray:
+        """Latest NAV of each of the most recent `n` months (a view)."""
+        return self.monthly_navs[len(self.monthly_navs) - n:]
+
+
+@_ttl_cache(SCHEME_TTL_SECONDS, maxsize=64)
+def _preprocessed_history(scheme_code: str) -> _NavHistory:
+    """Parse, sort and bucket a scheme's NAV history once per cache window."""
+    history = _fetch_historical_nav(scheme_code)
+    raw_entries = history.get('data', [])
+
+    date_keys = np.array([_date_key(record['date']) for record in raw_entries], dtype=np.int64)
+    navs = np.array([record['nav'] for record in raw_entries], dtype=np.float64)
+
+    # AMFI histories contain placeholder 0.00000 NAV rows; they are not prices.
+    valid = navs > 0
+    date_keys, navs = date_keys[valid], navs[valid]
+
+    order = np.argsort(date_keys, kind='stable')
+    date_keys, navs = date_keys[order], navs[order]
+    month_index = (date_keys // 10000) * 12 + (date_keys // 100) % 100 - 1
+
+    # Keep the latest NAV of each month.
+    is_month_end = np.append(month_index[1:] != month_index[:-1], True)
+    return _NavHistory(
+        scheme_name=history.get('scheme_name'),
+        navs=navs,
+        monthly_navs=navs[is_month_end] if navs.size else navs,
+    )
+
+
 @tool("Get Mutual Fund Details")
 def get_scheme_details(scheme_code: str) -> Dict:
     """
@@ -18,7 +156,7 @@ def get_scheme_details(scheme_code: str) -> Dict:
         Dictionary with scheme details
     """
     try:
-        data = mf.get_scheme_quote(scheme_code)
+        data = _fetch_scheme_quote(scheme_code)
         return {
             "scheme_code": scheme_code,
             "scheme_name": data.get('scheme_name'),
@@ -32,6 +170,37 @@ def get_scheme_details(scheme_code: str) -> Dict:
         return {"error": f"Failed to fetch scheme details: {str(e)}"}
 
 
+@tool("Get Multiple Scheme Details")
+def get_scheme_details_bulk(scheme_codes: str) -> List[Dict]:
+    """
+    Get the latest NAV, fund house and category for several mutual fund
+    schemes at once. Prefer this over repeated single-scheme lookups.
+    
+    Args:
+        scheme_codes: Comma separated AMFI scheme codes (e.g., '119551,120503')
+    
+    Returns:
+        List of scheme details, one per scheme code
+    """
+    try:
+        codes = [code.strip() for code in scheme_codes.split(',') if code.strip()]
+        if not codes:
+            return {"error": "No scheme codes provided."}
+
+        # Share quotes with get_scheme_details: serve cached codes directly and
+        # cache whatever the concurrent fetch returns successfully.
+        quotes = {code: _fetch_scheme_quote.cache_get(code) for code in codes}
+        missing = [code for code, quote in quotes.items() if quote is None]
+        if missing:
+            for quote in fetch_many_quotes(missing):
+                if "error" not in quote:
+                    _fetch_scheme_quote.cache_set(quote, quote["scheme_code"])
+                quotes[quote["scheme_code"]] = quote
+        return [quotes[code] for code in codes]
+    except Exception as e:
+        return {"error": f"Failed to fetch scheme details: {str(e)}"}
+
+
 @tool("Get Historical NAV")
 def get_historical_nav(scheme_code: str, days: int = 30) -> Dict:
     """
@@ -45,99 +214,57 @@ def get_historical_nav(scheme_code: str, days: int = 30) -> Dict:
         Dictionary with historical NAV data
     """
     try:
-        data = mf.get_scheme_historical_nav(scheme_code)
+        data = _fetch_historical_nav(scheme_code)
         return {
             "scheme_code": scheme_code,
-            "historical_nav": data['data'][:days],
+            "historical_nav": data['data'][:max(days, 0)],
             "fund_house": data.get('fund_house')
         }
     except Exception as e:
         return {"error": f"Failed to fetch historical NAV: {str(e)}"}
 
 
-@tool("Get Large Cap Funds")
-def get_large_cap_funds() -> List[Dict]:
-    """
-    Get list of all large cap equity mutual funds with performance data.
-    
-    Returns:
-        List of large cap funds with returns data
-    """
-    try:
-        performance = mf.get_open_ended_equity_scheme_performance(as_json=True)
-        return performance.get('Large Cap', [])[:15]
-    except Exception as e:
-        return {"error": f"Failed to fetch large cap funds: {str(e)}"}
+def _top_funds(category: str, limit: int = 15) -> List[Dict]:
+    """Top `limit` funds of an AMFI equity category from the cached performance sheet."""
+    return _fetch_performance().get(category, [])[:limit]
 
 
-@tool("Get Mid Cap Funds")
-def get_mid_cap_funds() -> List[Dict]:
+@tool("Get All Cap Funds")
+def get_all_cap_funds() -> Dict[str, List[Dict]]:
     """
-    Get list of all mid cap equity mutual funds with performance data.
+    Get large, mid and small cap equity mutual funds with performance data
+    in a single call.
     
     Returns:
-        List of mid cap funds with returns data
+        Dictionary with 'large', 'mid' and 'small' lists of funds with returns data
     """
     try:
-        performance = mf.get_open_ended_equity_scheme_performance(as_json=True)
-        return performance.get('Mid Cap', [])[:15]
+        return {
+            "large": _top_funds('Large Cap'),
+            "mid": _top_funds('Mid Cap'),
+            "small": _top_funds('Small Cap')
+        }
     except Exception as e:
-        return {"error": f"Failed to fetch mid cap funds: {str(e)}"}
+        return {"error": f"Failed to fetch cap funds: {str(e)}"}
 
 
-@tool("Get Small Cap Funds")
-def get_small_cap_funds() -> List[Dict]:
-    """
-    Get list of all small cap equity mutual funds with performance data.
-    
-    Returns:
-        List of small cap funds with returns data
+def _monthly_irr(cash_flows: np.ndarray) -> float:
+    """Compute the monthly IRR for evenly spaced cash flows.
+
+    Newton-Raphson is seeded from the overall growth of the investment and
+    bisection is kept as the fallback when it fails to converge.
     """
-    try:
-        performance = mf.get_open_ended_equity_scheme_performance(as_json=True)
-        return performance.get('Small Cap', [])[:15]
-    except Exception as e:
-        return {"error": f"Failed to fetch small cap funds: {str(e)}"}
-
-
-def _monthly_irr(cash_flows: Sequence[float], tol: float = 1e-6, max_iter: int = 200) -> float:
-    """Compute the monthly IRR for evenly spaced cash flows using bisection."""
-
-    def npv(rate: float) -> float:
-        total = 0.0
-        factor = 1.0
-        for cf in cash_flows:
-            total += cf / factor
-            factor *= (1 + rate)
-        return total
-
-    low, high = -0.9999, 1.0
-    npv_low = npv(low)
-    npv_high = npv(high)
-
-    # Expand the upper bound until we bracket the root or hit a ceiling.
-    expansion_steps = 0
-    while npv_low * npv_high > 0 and expansion_steps < 10:
-        high += 1.0
-        npv_high = npv(high)
-        expansion_steps += 1
-
-    if npv_low * npv_high > 0:
-        # Fallback: IRR cannot be determined with current cash flows.
-        return 0.0
-
-    for _ in range(max_iter):
-        rate = (low + high) / 2
-        npv_mid = npv(rate)
-        if abs(npv_mid) < tol:
-            return rate
-        if npv_low * npv_mid < 0:
-            high = rate
-            npv_high = npv_mid
-        else:
-            low = rate
-            npv_low = npv_mid
-    return rate
+    n_months = cash_flows.shape[0] - 1
+    total_invested = -cash_flows[:-1].sum()
+    final_value = cash_flows[-1]
+    guess = 0.01
+    if n_months > 0 and total_invested > 0 and final_value > 0:
+        guess = (final_value / total_invested) ** (1 / n_months) - 1
+
+    rate = _irr_newton(cash_flows, guess)
+    if np.isnan(rate):
+        rate = _bisect_irr(cash_flows)
+    return float(rate)
 
 
 @tool("Calculate SIP Returns")
@@ -158,55 +285,47 @@ def calculate_sip_returns(
         Dictionary with SIP returns data including IRR
     """
     try:
-        history = mf.get_scheme_historical_nav(scheme_code)
-        scheme_name = history.get('scheme_name')
-        raw_entries = history.get('data', [])
-        if not raw_entries:
-            return {"error": "No historical NAV data available for SIP calculation."}
+        if investment_months < 1:
+            return {"error": "investment_months must be at least 1 for SIP calculation."}
 
-        chronological_entries = sorted(
-            raw_entries,
-            key=lambda x: datetime.strptime(x['date'], "%d-%m-%Y")
-        )
-
-        # Group NAVs by month (YYYY-MM) ensuring we capture the latest NAV per month.
-        monthly_navs = {}
-        for record in chronological_entries:
-            month_key = datetime.strptime(record['date'], "%d-%m-%Y").strftime("%Y-%m")
-            monthly_navs[month_key] = float(record['nav'])
+        history = _preprocessed_history(scheme_code)
+        if not history.navs.size:
+            return {"error": "No historical NAV data available for SIP calculation."}
 
-        if len(monthly_navs) < investment_months:
+        months_available = len(history.monthly_navs)
+        if months_available < investment_months:
             return {
                 "error": (
-                    f"Only {len(monthly_navs)} months of NAV data available; "
+                    f"Only {months_available} months of NAV data available; "
                     f"{investment_months} required for SIP calculation."
                 )
             }
 
         # Use the most recent investment_months entries for SIP computation.
-        selected_months = list(monthly_navs.items())[-investment_months:]
+        selected_navs = history.navs_last_n(investment_months)
 
-        total_units = 0.0
-        cash_flows = []
-        for _, nav in selected_months:
-            units = monthly_sip / nav
-            total_units += units
-            cash_flows.append(-monthly_sip)
+        units_per_month = monthly_sip / selected_navs
+        total_units = float(units_per_month.sum())
 
-        current_nav = float(chronological_entries[-1]['nav'])
+        current_nav = float(history.navs[-1])
         current_value = total_units * current_nav
-        cash_flows.append(current_value)
+        if not math.isfinite(current_value):
+            return {"error": "Invalid NAV data for SIP calculation."}
+
+        cash_flows = np.empty(investment_months + 1, dtype=np.float64)
+        cash_flows[:investment_months] = -monthly_sip
+        cash_flows[-1] = current_value
 
         total_invested = monthly_sip * investment_months
         absolute_gain = current_value - total_invested
         absolute_return_pct = (absolute_gain / total_invested) * 100 if total_invested else 0.0
 
         monthly_irr = _monthly_irr(cash_flows)
-        irr_annualized = ((1 + monthly_irr) ** 12 - 1) * 100 if monthly_irr is not None else None
+        irr_annualized = math.expm1(12 * math.log1p(monthly_irr)) * 100 if monthly_irr is not None else None
 
         return {
             "scheme_code": scheme_code,
-            "scheme_name": scheme_name,
+            "scheme_name": history.scheme_name,
             "current_nav": current_nav,
             "months_considered": investment_months,
             "total_invested": round(total_invested, 2),
@@ -220,6 +339,45 @@ def calculate_sip_returns(
         return {"error": f"Failed to calculate SIP returns manually: {str(e)}"}
 
 
+# The pure calculations below are memoized separately from their @tool
+# wrappers: agents often repeat a tool call with identical arguments.
+@lru_cache(maxsize=1024)
+def _lumpsum(
+    purchase_nav: float,
+    current_nav: float,
+    investment_amount: float,
+    holding_years: float
+) -> Tuple[float, float, float, float, float]:
+    """Return (units, current value, gain, absolute return %, CAGR %)."""
+    units = investment_amount / purchase_nav
+    current_value = units * current_nav
+    gain = current_value - investment_amount
+    absolute_return = (gain / investment_amount) * 100
+    ratio = current_value / investment_amount
+    if ratio > 0:
+        cagr = (math.exp(math.log(ratio) / holding_years) - 1) * 100
+    else:
+        # A wiped-out investment has no logarithm; its CAGR is -100%.
+        cagr = -100.0
+    return units, current_value, gain, absolute_return, cagr
+
+
+@lru_cache(maxsize=1024)
+def _capital_gains(
+    gain_amount: float,
+    holding_months: int,
+    fund_type: str
+) -> Optional[Tuple[str, str, float, float, float]]:
+    """Return (gain type, rate, exempt amount, taxable gain, tax), or None."""
+    rule = _TAX_RULES.get((fund_type, "short" if holding_months < 12 else "long"))
+    if rule is None:
+        return None
+
+    rate, exempt_amount, gain_type, tax_rate = rule
+    taxable_gain = max(0, gain_amount - exempt_amount)
+    return gain_type, tax_rate, exempt_amount, taxable_gain, taxable_gain * rate
+
+
 @tool("Calculate Lumpsum Returns")
 def calculate_lumpsum_returns(
     purchase_nav: float,
@@ -240,12 +398,10 @@ def calculate_lumpsum_returns(
         Dictionary with lumpsum returns including CAGR
     """
     try:
-        units = investment_amount / purchase_nav
-        current_value = units * current_nav
-        gain = current_value - investment_amount
-        absolute_return = (gain / investment_amount) * 100
-        cagr = (((current_value / investment_amount) ** (1 / holding_years)) - 1) * 100
-        
+        units, current_value, gain, absolute_return, cagr = _lumpsum(
+            purchase_nav, current_nav, investment_amount, holding_years
+        )
+
         return {
             "invested_amount": investment_amount,
             "units_purchased": round(units, 3),
@@ -282,36 +438,21 @@ def calculate_capital_gains_tax(
         Dictionary with tax calculation details
     """
     try:
-        if fund_type.lower() == "equity":
-            if holding_months < 12:
-                # Short term capital gains
-                tax = gain_amount * 0.20
-                return {
-                    "fund_type": "Equity",
-                    "holding_period_months": holding_months,
-                    "gain_type": "Short Term (STCG)",
-                    "tax_rate": "20%",
-                    "taxable_gain": gain_amount,
-                    "tax_amount": round(tax, 2),
-                    "post_tax_gain": round(gain_amount - tax, 2)
-                }
-            else:
-                # Long term capital gains
-                exempt_amount = 125000
-                taxable_gain = max(0, gain_amount - exempt_amount)
-                tax = taxable_gain * 0.125
-                return {
-                    "fund_type": "Equity",
-                    "holding_period_months": holding_months,
-                    "gain_type": "Long Term (LTCG)",
-                    "tax_rate": "12.5%",
-                    "total_gain": gain_amount,
-                    "exempt_amount": exempt_amount,
-                    "taxable_gain": taxable_gain,
-                    "tax_amount": round(tax, 2),
-                    "post_tax_gain": round(gain_amount - tax, 2)
-                }
-        else:
+        result = _capital_gains(gain_amount, holding_months, fund_type.lower())
+        if result is None:
             return {"error": "Debt fund taxation requires income tax slab information"}
+
+        gain_type, tax_rate, exempt_amount, taxable_gain, tax = result
+        return {
+            "fund_type": fund_type.capitalize(),
+            "holding_period_months": holding_months,
+            "gain_type": gain_type,
+            "tax_rate": tax_rate,
+            "total_gain": gain_amount,
+            "exempt_amount": exempt_amount,
+            "taxable_gain": taxable_gain,
+            "tax_amount": round(tax, 2),
+            "post_tax_gain": round(gain_amount - tax, 2)
+        }
     except Exception as e:
         return {"error": f"Failed to calculate tax: {str(e)}"}
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import httpx
+
+MFAPI_LATEST_URL = "https://api.mfapi.in/mf/{code}/latest"
+MAX_CONNECTIONS = 16
+REQUEST_TIMEOUT_SECONDS = 25
+
+
+def _parse_quote(scheme_code: str, payload: Dict) -> Dict:
+    meta = payload.get('meta') or {}
+    data = payload.get('data') or []
+    if not meta or not data:
+        # mfapi answers unknown codes with an empty payload rather than a 404.
+        return {"scheme_code": scheme_code, "error": "No data for scheme"}
+
+    latest = data[0]
+    return {
+        "scheme_code": scheme_code,
+        "scheme_name": meta.get('scheme_name'),
+        "nav": latest.get('nav'),
+        "last_updated": latest.get('date'),
+        "scheme_type": meta.get('scheme_type'),
+        "scheme_category": meta.get('scheme_category'),
+        "fund_house": meta.get('fund_house')
+    }
+
+
+def fetch_quote(scheme_code: str) -> Dict:
+    """
+    Fetch the latest NAV quote for one scheme.
+
+    Raises on HTTP failures and unknown scheme codes so that callers caching
+    the result never store an error.
+    """
+    response = httpx.get(
+        MFAPI_LATEST_URL.format(code=scheme_code), timeout=REQUEST_TIMEOUT_SECONDS
+    )
+    response.raise_for_status()
+    quote = _parse_quote(scheme_code, response.json())
+    if "error" in quote:
+        raise ValueError(quote["error"])
+    return quote
+
+
+def _fetch_quote(client: httpx.Client, scheme_code: str) -> Dict:
+    try:
+        response = client.get(MFAPI_LATEST_URL.format(code=scheme_code))
+        response.raise_for_status()
+        payload = response.json()
+    except Exception as e:
+        return {"scheme_code": scheme_code, "error": f"Failed to fetch scheme details: {str(e)}"}
+    return _parse_quote(scheme_code, payload)
+
+
+def fetch_many_quotes(codes: List[str]) -> List[Dict]:
+    """
+    Fetch the latest NAV quote for several schemes concurrently.
+
+    Requests fan out over a small thread pool sharing one connection pool, so
+    this is safe to call from threads that already run an event loop. Each
+    failed code yields an error entry in place, so one bad scheme code does
+    not discard the rest of the batch.
+    """
+    if not codes:
+        return []
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS)
+    with httpx.Client(limits=limits, timeout=REQUEST_TIMEOUT_SECONDS) as client:
+        with ThreadPoolExecutor(max_workers=min(MAX_CONNECTIONS, len(codes))) as pool:
+            return list(pool.map(lambda code: _fetch_quote(client, code), codes))
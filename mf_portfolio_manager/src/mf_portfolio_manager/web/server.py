@@ -2,25 +2,41 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import queue
+import time
 from pathlib import Path
 from typing import Any, List, Optional
 
+from crewai import Crew
 from fastapi import FastAPI, HTTPException
 from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from mf_portfolio_manager.crew import MutualFundCrew
 
+# Crew and agent verbose output blocks the worker threads; keep it off unless
+# explicitly requested.
+os.environ.setdefault("CREW_VERBOSE", "0")
+
 logger = logging.getLogger("mf_portfolio_manager.web")
 logging.basicConfig(level=logging.INFO)
+logger.setLevel(os.getenv("MFPM_LOG_LEVEL", "WARNING").upper())
 
 STATIC_DIR = Path(__file__).resolve().parent / "static"
 
+# Upper bound on concurrent crew runs; also the number of crews kept warm.
+CREW_POOL_SIZE = int(os.getenv("MFPM_CREW_POOL_SIZE", "4"))
+# Maximum number of chats accepted by a single /api/chat_batch request.
+MAX_BATCH_SIZE = int(os.getenv("MFPM_MAX_BATCH_SIZE", "16"))
+
 
 class HistoryEntry(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     role: str
     content: str
 
@@ -68,9 +84,9 @@ class ChatRequest(BaseModel):
             "fund_categories": self.fund_categories,
             "investment_goal": self.investment_goal or self.message,
             "user_prompt": self.message,
-            "chat_history": [
+            "chat_history": "\n".join(
                 f"{entry.role}: {entry.content}" for entry in self.history
-            ],
+            ),
         }
         return inputs
 
@@ -80,6 +96,20 @@ class ChatResponse(BaseModel):
     inputs: dict[str, Any]
 
 
+class BatchChatRequest(BaseModel):
+    items: List[ChatRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchChatItem(BaseModel):
+    reply: Optional[str] = None
+    error: Optional[str] = None
+    inputs: dict[str, Any]
+
+
+class BatchChatResponse(BaseModel):
+    items: List[BatchChatItem]
+
+
 app = FastAPI(title="Mutual Fund Portfolio Manager Chat API")
 
 app.add_middleware(
@@ -102,24 +132,77 @@ async def index() -> FileResponse:
     return FileResponse(STATIC_DIR / "index.html")
 
 
-async def _run_crew(inputs: dict[str, Any]) -> str:
-    def _kickoff() -> str:
+# Crew.kickoff is not re-entrant, so every concurrent run checks out its own
+# crew. Crews are built on first use and returned to the pool afterwards
+# instead of being rebuilt (YAML, agents, tools) on every request.
+_crew_pool: queue.SimpleQueue[Crew] = queue.SimpleQueue()
+_crew_slots = asyncio.Semaphore(CREW_POOL_SIZE)
+
+
+def _checkout_crew() -> Crew:
+    try:
+        return _crew_pool.get_nowait()
+    except queue.Empty:
+        return MutualFundCrew().crew()
+
+
+async def _run_crew(inputs: dict[str, Any]) -> tuple[str, float]:
+    """Run the crew and return its reply with the kickoff time in seconds."""
+
+    def _kickoff() -> tuple[str, float]:
         logger.info("Starting crew run with inputs: %s", inputs)
-        crew = MutualFundCrew().crew()
+        started = time.perf_counter()
+        crew = _checkout_crew()
         result = crew.kickoff(inputs=inputs)
-        logger.info("Crew completed.")
-        return str(result)
+        # Only crews that finished cleanly go back to the pool.
+        _crew_pool.put(crew)
+        elapsed = time.perf_counter() - started
+        logger.info("Crew completed in %.2fs.", elapsed)
+        return str(result), elapsed
 
-    return await run_in_threadpool(_kickoff)
+    async with _crew_slots:
+        return await run_in_threadpool(_kickoff)
 
 
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat_endpoint(payload: ChatRequest) -> ChatResponse:
     try:
         inputs = payload.to_inputs()
-        reply = await _run_crew(inputs)
+        reply, _ = await _run_crew(inputs)
         return ChatResponse(reply=reply, inputs=inputs)
     except Exception as exc:  # pragma: no cover - surfaced to UI
         logger.exception("Crew run failed")
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+
+@app.post("/api/chat_batch", response_model=BatchChatResponse)
+async def chat_batch_endpoint(payload: BatchChatRequest) -> BatchChatResponse:
+    batch_inputs = [item.to_inputs() for item in payload.items]
+    started = time.perf_counter()
+    # A failing item must not discard the replies of the others.
+    results = await asyncio.gather(
+        *(_run_crew(inputs) for inputs in batch_inputs), return_exceptions=True
+    )
+    wall_time = time.perf_counter() - started
+
+    items = []
+    item_times = []
+    for index, (result, inputs) in enumerate(zip(results, batch_inputs)):
+        if isinstance(result, Exception):
+            logger.error("Batch item %d failed", index, exc_info=result)
+            items.append(BatchChatItem(error=str(result), inputs=inputs))
+            continue
+        reply, elapsed = result
+        logger.info("Batch item %d completed in %.2fs.", index, elapsed)
+        item_times.append(elapsed)
+        items.append(BatchChatItem(reply=reply, inputs=inputs))
+
+    # Batch efficiency: sequential time over parallel wall time.
+    logger.info(
+        "Batch of %d completed in %.2fs with %d failures (efficiency %.2f).",
+        len(items),
+        wall_time,
+        len(items) - len(item_times),
+        sum(item_times) / wall_time if wall_time else 0.0,
+    )
+    return BatchChatResponse(items=items)